@@ -4,8 +4,10 @@ from __future__ import annotations
 import logging
 import asyncio
 import json
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
 import voluptuous as vol
 
@@ -13,14 +15,17 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     EVENT_HOMEASSISTANT_START,
-    EVENT_STATE_CHANGED,
     SERVICE_TURN_ON,
     STATE_ON,
 )
 from homeassistant.core import Event, HomeAssistant, ServiceCall, State, callback
 from homeassistant.helpers import entity_registry
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
@@ -30,8 +35,10 @@ from .const import (
     CONF_MOTION_SENSORS,
     CONF_TRANSITION,
     CONF_SAVE_INTERVAL,
+    CONF_MAX_STATES,
     DEFAULT_TRANSITION,
     DEFAULT_SAVE_INTERVAL,
+    DEFAULT_MAX_STATES,
     SERVICE_SAVE_STATE,
     SERVICE_RESTORE_STATE,
     SERVICE_CLEAR_STATES,
@@ -44,10 +51,30 @@ from .const import (
     ATTR_EFFECT,
     EVENT_STATE_SAVED,
     EVENT_STATE_RESTORED,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    SAVE_QUEUE_SIZE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+_LIGHT_ATTRS = (
+    ATTR_BRIGHTNESS,
+    ATTR_COLOR_TEMP,
+    ATTR_HS_COLOR,
+    ATTR_RGB_COLOR,
+    ATTR_XY_COLOR,
+    ATTR_EFFECT,
+)
+_LIGHT_ATTRS_SET = frozenset(_LIGHT_ATTRS)
+
+@dataclass(slots=True)
+class LightSnapshot:
+    """Saved state of a single light."""
+
+    state: str
+    payload: Dict[str, Any]
+
 SAVE_STATE_SCHEMA = vol.Schema({
     vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
 })
@@ -60,6 +87,33 @@ CLEAR_STATES_SCHEMA = vol.Schema({
     vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
 })
 
+def _get_light_state(state: State) -> LightSnapshot:
+    """Get the relevant state data for a light.
+
+    The turn_on payload is kept pre-built so restore does not have to
+    filter the snapshot per entity.
+    """
+    attrs = state.attributes
+    # frozenset.intersection(dict) resolves membership in C, so each
+    # present attribute costs a single hash lookup.
+    return LightSnapshot(
+        state=state.state,
+        payload={
+            attr: attrs[attr] for attr in _LIGHT_ATTRS_SET.intersection(attrs)
+        },
+    )
+
+def _snapshot_from_dict(data: dict[str, Any]) -> LightSnapshot:
+    """Build a snapshot from a stored dict, accepting older flat formats."""
+    if "payload" in data:
+        return LightSnapshot(state=data["state"], payload=data["payload"])
+    if "_payload" in data:
+        return LightSnapshot(state=data["state"], payload=data["_payload"])
+    return LightSnapshot(
+        state=data.get("state"),
+        payload={k: v for k, v in data.items() if k != "state"},
+    )
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Light State Management from a config entry."""
     domain_data = hass.data.setdefault(DOMAIN, {})
@@ -72,11 +126,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    if unload_ok := True:
-        manager = hass.data[DOMAIN].pop(entry.entry_id)
-        await manager.async_unload()
-
-    return unload_ok
+    manager = hass.data[DOMAIN].pop(entry.entry_id)
+    await manager.async_unload()
+    return True
 
 class LightStateManager:
     """Class to manage light states."""
@@ -85,13 +137,38 @@ class LightStateManager:
         """Initialize the manager."""
         self.hass = hass
         self.entry = entry
-        self._states: Dict[str, Dict[str, Any]] = {}
+        self._states: OrderedDict[str, LightSnapshot] = OrderedDict()
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+        self._max_states = entry.data.get(CONF_MAX_STATES, DEFAULT_MAX_STATES)
+        self._saved_signatures: Dict[str, tuple] = {}
         self._motion_active: Dict[str, bool] = {}
+        self._lights: tuple[str, ...] = ()
+        self._valid_lights: frozenset[str] = frozenset()
         self._cancel_save_interval = None
+        self._cancel_motion = None
+        self._cancel_entry_update = None
+        self._restore_task: asyncio.Task | None = None
+        self._restore_pending = False
+        self._save_queue: asyncio.Queue = asyncio.Queue(maxsize=SAVE_QUEUE_SIZE)
+        self._save_worker: asyncio.Task | None = None
         self._setup_complete = False
 
     async def async_setup(self) -> None:
         """Set up the manager."""
+        if stored := await self._store.async_load():
+            self._states = OrderedDict(
+                (eid, _snapshot_from_dict(snap)) for eid, snap in stored.items()
+            )
+
+        self._lights = tuple(self.entry.data.get(CONF_LIGHTS) or ())
+        self._valid_lights = frozenset(self._lights)
+        self._cancel_entry_update = self.entry.add_update_listener(
+            self._handle_entry_update
+        )
+        self._save_worker = self.hass.async_create_task(self._drain_save_queue())
+
         # Register services
         self.hass.services.async_register(
             DOMAIN,
@@ -124,22 +201,23 @@ class LightStateManager:
             )
 
         # Listen for motion sensor state changes
-        if motion_sensors := self.entry.data.get(CONF_MOTION_SENSORS):
+        motion_sensors = frozenset(self.entry.data.get(CONF_MOTION_SENSORS) or ())
+        if motion_sensors:
             @callback
             def handle_motion(event: Event) -> None:
                 """Handle motion sensor state changes."""
-                entity_id = event.data["entity_id"]
-                if entity_id not in motion_sensors:
-                    return
-
                 new_state = event.data["new_state"]
                 if new_state is None:
                     return
 
-                self._motion_active[entity_id] = new_state.state == STATE_ON
+                self._motion_active[event.data["entity_id"]] = (
+                    new_state.state == STATE_ON
+                )
                 self._handle_motion_change()
 
-            self.hass.bus.async_listen(EVENT_STATE_CHANGED, handle_motion)
+            self._cancel_motion = async_track_state_change_event(
+                self.hass, list(motion_sensors), handle_motion
+            )
 
         self._setup_complete = True
 
@@ -148,77 +226,203 @@ class LightStateManager:
         if self._cancel_save_interval is not None:
             self._cancel_save_interval()
 
+        if self._cancel_motion is not None:
+            self._cancel_motion()
+
+        if self._cancel_entry_update is not None:
+            self._cancel_entry_update()
+
+        if self._restore_task is not None and not self._restore_task.done():
+            self._restore_task.cancel()
+            try:
+                await self._restore_task
+            except asyncio.CancelledError:
+                pass
+        self._restore_task = None
+        self._restore_pending = False
+
         self.hass.services.async_remove(DOMAIN, SERVICE_SAVE_STATE)
         self.hass.services.async_remove(DOMAIN, SERVICE_RESTORE_STATE)
         self.hass.services.async_remove(DOMAIN, SERVICE_CLEAR_STATES)
 
-    def _get_light_state(self, state: State) -> dict[str, Any]:
-        """Get the relevant state data for a light."""
-        attrs = state.attributes
-        data = {"state": state.state}
-
-        # Add relevant attributes
-        for attr in (
-            ATTR_BRIGHTNESS,
-            ATTR_COLOR_TEMP,
-            ATTR_HS_COLOR,
-            ATTR_RGB_COLOR,
-            ATTR_XY_COLOR,
-            ATTR_EFFECT,
-        ):
-            if attr in attrs:
-                data[attr] = attrs[attr]
-
-        return data
+        if self._save_worker is not None:
+            # Drop-oldest like _enqueue_saved so a backlogged queue
+            # cannot raise QueueFull and abort the unload.
+            try:
+                self._save_queue.put_nowait(None)
+            except asyncio.QueueFull:
+                self._save_queue.get_nowait()
+                self._save_queue.put_nowait(None)
+
+            try:
+                await self._save_worker
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Save queue worker failed during unload")
+            self._save_worker = None
+
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Dict[str, Any]]:
+        """Return the saved states in a storage-serializable form."""
+        return {eid: asdict(snap) for eid, snap in self._states.items()}
+
+    async def _handle_entry_update(
+        self, hass: HomeAssistant, entry: ConfigEntry
+    ) -> None:
+        """Refresh cached configuration when the entry is updated."""
+        self._lights = tuple(entry.data.get(CONF_LIGHTS) or ())
+        self._valid_lights = frozenset(self._lights)
 
     async def _handle_save_state(self, call: ServiceCall) -> None:
         """Handle the save state service call."""
-        entity_ids = call.data[ATTR_ENTITY_ID]
-        
-        for entity_id in entity_ids:
-            if not entity_id.startswith("light."):
+        await self._do_save(call.data[ATTR_ENTITY_ID])
+
+    async def _do_save(self, entity_ids: Iterable[str]) -> None:
+        """Save the current state of the given lights."""
+        # Restrict saves to the configured lights, which also rejects
+        # non-light entity_ids without a per-entity domain check.
+        if valid_lights := self._valid_lights:
+            lights = [eid for eid in entity_ids if eid in valid_lights]
+        else:
+            lights = [eid for eid in entity_ids if eid.startswith("light.")]
+
+        states_get = self.hass.states.get
+        saved: list[str] = []
+        for entity_id in lights:
+            state = states_get(entity_id)
+            if state is None:
                 continue
 
-            state = self.hass.states.get(entity_id)
-            if state is None:
+            # Cheap tuple equality lets unchanged lights skip the dict
+            # rewrite entirely, which is the common case on interval saves.
+            attrs = state.attributes
+            signature = (
+                state.state,
+                tuple(attrs.get(attr) for attr in _LIGHT_ATTRS),
+            )
+            if self._saved_signatures.get(entity_id) == signature:
                 continue
 
-            self._states[entity_id] = self._get_light_state(state)
-            
-            self.hass.bus.fire(
-                EVENT_STATE_SAVED,
-                {"entity_id": entity_id, "state": self._states[entity_id]}
+            self._states[entity_id] = _get_light_state(state)
+            self._states.move_to_end(entity_id)
+            self._saved_signatures[entity_id] = signature
+            saved.append(entity_id)
+
+        # Build the event payload before evicting: a batch larger than
+        # max_states would otherwise evict entities saved in this pass.
+        if saved:
+            self._enqueue_saved(
+                {
+                    "entity_ids": saved,
+                    "states": {eid: asdict(self._states[eid]) for eid in saved},
+                }
             )
 
+        while len(self._states) > self._max_states:
+            evicted, _ = self._states.popitem(last=False)
+            self._saved_signatures.pop(evicted, None)
+
+    @callback
+    def _enqueue_saved(self, payload: Dict[str, Any]) -> None:
+        """Hand a save payload to the background writer, dropping oldest on overflow."""
+        try:
+            self._save_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            _LOGGER.warning("Save queue full; dropping oldest payload")
+            self._save_queue.get_nowait()
+            self._save_queue.put_nowait(payload)
+
+    async def _drain_save_queue(self) -> None:
+        """Fire saved events and schedule persistence off the save hot path."""
+        while (payload := await self._save_queue.get()) is not None:
+            self.hass.bus.async_fire(EVENT_STATE_SAVED, payload)
+            # Coalesce bursts of saves into one disk write.
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
     async def _handle_restore_state(self, call: ServiceCall) -> None:
         """Handle the restore state service call."""
-        entity_ids = call.data[ATTR_ENTITY_ID]
+        await self._do_restore(call.data[ATTR_ENTITY_ID])
+
+    async def _do_restore(self, entity_ids: Iterable[str]) -> None:
+        """Restore the saved state of the given lights."""
         transition = self.entry.data.get(CONF_TRANSITION, DEFAULT_TRANSITION)
 
+        # Group entities that share an identical restore payload so each
+        # group needs only one light.turn_on call.
+        states_get = self.hass.states.get
+        groups: dict[tuple, list[str]] = {}
+        restored: dict[str, LightSnapshot] = {}
         for entity_id in entity_ids:
-            if entity_id not in self._states:
+            snapshot = self._states.get(entity_id)
+            if snapshot is None or snapshot.state != STATE_ON:
                 continue
 
-            state_data = self._states[entity_id]
-            if state_data["state"] != STATE_ON:
+            # Skip lights already in the saved state; restoring them
+            # would be a no-op service call.
+            payload = snapshot.payload
+            current = states_get(entity_id)
+            if (
+                current is not None
+                and current.state == STATE_ON
+                and all(
+                    current.attributes.get(k) == v for k, v in payload.items()
+                )
+            ):
                 continue
 
-            service_data = {"entity_id": entity_id, "transition": transition}
-            service_data.update(
-                {k: v for k, v in state_data.items() if k != "state"}
-            )
+            key = tuple(sorted(
+                (k, tuple(v) if isinstance(v, list) else v)
+                for k, v in payload.items()
+            ))
+            groups.setdefault(key, []).append(entity_id)
+            restored[entity_id] = snapshot
 
-            await self.hass.services.async_call(
+        if not groups:
+            return
+
+        service_datas = [
+            {
+                "entity_id": group_ids,
+                "transition": transition,
+                **restored[group_ids[0]].payload,
+            }
+            for group_ids in groups.values()
+        ]
+
+        results = await asyncio.gather(*(
+            self.hass.services.async_call(
                 "light",
                 SERVICE_TURN_ON,
                 service_data,
                 blocking=True,
             )
+            for service_data in service_datas
+        ), return_exceptions=True)
+
+        for service_data, result in zip(service_datas, results):
+            if isinstance(result, Exception):
+                _LOGGER.error(
+                    "Failed to restore state for %s: %s",
+                    service_data["entity_id"],
+                    result,
+                )
+                for entity_id in service_data["entity_id"]:
+                    restored.pop(entity_id, None)
 
-            self.hass.bus.fire(
-                EVENT_STATE_RESTORED,
-                {"entity_id": entity_id, "state": state_data}
-            )
+        if not restored:
+            return
+
+        for entity_id in restored:
+            self._states.move_to_end(entity_id)
+
+        self.hass.bus.async_fire(
+            EVENT_STATE_RESTORED,
+            {
+                "entity_ids": list(restored),
+                "states": {eid: asdict(snap) for eid, snap in restored.items()},
+            },
+        )
 
     async def _handle_clear_states(self, call: ServiceCall) -> None:
         """Handle the clear states service call."""
@@ -226,16 +430,16 @@ class LightStateManager:
         
         for entity_id in entity_ids:
             self._states.pop(entity_id, None)
+            self._saved_signatures.pop(entity_id, None)
+
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
 
     async def _handle_interval_save(self, now: datetime) -> None:
         """Handle periodic state saving."""
         if not self._setup_complete:
             return
 
-        entity_ids = self.entry.data.get(CONF_LIGHTS, [])
-        await self._handle_save_state(
-            ServiceCall(DOMAIN, SERVICE_SAVE_STATE, {ATTR_ENTITY_ID: entity_ids})
-        )
+        await self._do_save(self._lights)
 
     def _handle_motion_change(self) -> None:
         """Handle changes in motion sensor states."""
@@ -243,14 +447,22 @@ class LightStateManager:
             return
 
         # If any motion sensor is active, restore states
-        if any(self._motion_active.values()):
-            entity_ids = self.entry.data.get(CONF_LIGHTS, [])
-            self.hass.async_create_task(
-                self._handle_restore_state(
-                    ServiceCall(
-                        DOMAIN,
-                        SERVICE_RESTORE_STATE,
-                        {ATTR_ENTITY_ID: entity_ids}
-                    )
-                )
-            ) 
\ No newline at end of file
+        if not any(self._motion_active.values()):
+            return
+
+        # Coalesce bursts: if a restore is already running, mark it
+        # pending and let the running task pick it up.
+        if self._restore_task is not None and not self._restore_task.done():
+            self._restore_pending = True
+            return
+
+        self._restore_task = self.hass.async_create_task(self._motion_restore())
+
+    async def _motion_restore(self) -> None:
+        """Restore saved states, re-running once if motion fired meanwhile."""
+        while True:
+            await self._do_restore(self._lights)
+
+            if not self._restore_pending:
+                return
+            self._restore_pending = False 
\ No newline at end of file
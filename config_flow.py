@@ -20,6 +20,64 @@ from .const import (
     DEFAULT_SAVE_INTERVAL,
 )
 
+_LIGHT_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain="light", multiple=True)
+)
+
+_MOTION_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(
+        domain="binary_sensor",
+        device_class="motion",
+        multiple=True
+    )
+)
+
+_TRANSITION_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=10,
+        step=0.1,
+        unit_of_measurement="seconds"
+    )
+)
+
+_SAVE_INTERVAL_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=60,
+        max=3600,
+        step=60,
+        unit_of_measurement="seconds"
+    )
+)
+
+
+def _build_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Build the config/options schema, filling in the given defaults."""
+    lights_key = (
+        vol.Required(CONF_LIGHTS, default=defaults[CONF_LIGHTS])
+        if CONF_LIGHTS in defaults
+        else vol.Required(CONF_LIGHTS)
+    )
+    motion_key = (
+        vol.Optional(CONF_MOTION_SENSORS, default=defaults[CONF_MOTION_SENSORS])
+        if CONF_MOTION_SENSORS in defaults
+        else vol.Optional(CONF_MOTION_SENSORS)
+    )
+
+    return vol.Schema({
+        lights_key: _LIGHT_SELECTOR,
+        motion_key: _MOTION_SELECTOR,
+        vol.Optional(
+            CONF_TRANSITION,
+            default=defaults.get(CONF_TRANSITION, DEFAULT_TRANSITION)
+        ): _TRANSITION_SELECTOR,
+        vol.Optional(
+            CONF_SAVE_INTERVAL,
+            default=defaults.get(CONF_SAVE_INTERVAL, DEFAULT_SAVE_INTERVAL)
+        ): _SAVE_INTERVAL_SELECTOR,
+    })
+
+
 class LightStateManagementConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Light State Management."""
 
@@ -37,40 +95,7 @@ class LightStateManagementConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema({
-                vol.Required(CONF_LIGHTS): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain="light", multiple=True)
-                ),
-                vol.Optional(CONF_MOTION_SENSORS): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="binary_sensor",
-                        device_class="motion",
-                        multiple=True
-                    )
-                ),
-                vol.Optional(
-                    CONF_TRANSITION,
-                    default=DEFAULT_TRANSITION
-                ): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=10,
-                        step=0.1,
-                        unit_of_measurement="seconds"
-                    )
-                ),
-                vol.Optional(
-                    CONF_SAVE_INTERVAL,
-                    default=DEFAULT_SAVE_INTERVAL
-                ): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=60,
-                        max=3600,
-                        step=60,
-                        unit_of_measurement="seconds"
-                    )
-                ),
-            })
+            data_schema=_build_schema({})
         )
 
     @staticmethod
@@ -96,64 +121,23 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
+        data = self.config_entry.data
+        defaults = {
+            CONF_LIGHTS: options.get(CONF_LIGHTS, data.get(CONF_LIGHTS, [])),
+            CONF_MOTION_SENSORS: options.get(
+                CONF_MOTION_SENSORS, data.get(CONF_MOTION_SENSORS, [])
+            ),
+            CONF_TRANSITION: options.get(
+                CONF_TRANSITION, data.get(CONF_TRANSITION, DEFAULT_TRANSITION)
+            ),
+            CONF_SAVE_INTERVAL: options.get(
+                CONF_SAVE_INTERVAL,
+                data.get(CONF_SAVE_INTERVAL, DEFAULT_SAVE_INTERVAL)
+            ),
+        }
+
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({
-                vol.Required(
-                    CONF_LIGHTS,
-                    default=self.config_entry.options.get(
-                        CONF_LIGHTS,
-                        self.config_entry.data.get(CONF_LIGHTS, [])
-                    )
-                ): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain="light", multiple=True)
-                ),
-                vol.Optional(
-                    CONF_MOTION_SENSORS,
-                    default=self.config_entry.options.get(
-                        CONF_MOTION_SENSORS,
-                        self.config_entry.data.get(CONF_MOTION_SENSORS, [])
-                    )
-                ): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="binary_sensor",
-                        device_class="motion",
-                        multiple=True
-                    )
-                ),
-                vol.Optional(
-                    CONF_TRANSITION,
-                    default=self.config_entry.options.get(
-                        CONF_TRANSITION,
-                        self.config_entry.data.get(
-                            CONF_TRANSITION,
-                            DEFAULT_TRANSITION
-                        )
-                    )
-                ): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=0,
-                        max=10,
-                        step=0.1,
-                        unit_of_measurement="seconds"
-                    )
-                ),
-                vol.Optional(
-                    CONF_SAVE_INTERVAL,
-                    default=self.config_entry.options.get(
-                        CONF_SAVE_INTERVAL,
-                        self.config_entry.data.get(
-                            CONF_SAVE_INTERVAL,
-                            DEFAULT_SAVE_INTERVAL
-                        )
-                    )
-                ): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=60,
-                        max=3600,
-                        step=60,
-                        unit_of_measurement="seconds"
-                    )
-                ),
-            })
-        ) 
\ No newline at end of file
+            data_schema=_build_schema(defaults)
+        )
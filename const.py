@@ -8,10 +8,12 @@ CONF_LIGHTS = "lights"
 CONF_MOTION_SENSORS = "motion_sensors"
 CONF_TRANSITION = "transition"
 CONF_SAVE_INTERVAL = "save_interval"
+CONF_MAX_STATES = "max_states"
 
 # Defaults
 DEFAULT_TRANSITION = 1.0
 DEFAULT_SAVE_INTERVAL = 300  # 5 minutes
+DEFAULT_MAX_STATES = 512
 
 # Services
 SERVICE_SAVE_STATE = "save_state"
@@ -28,6 +30,11 @@ ATTR_RGB_COLOR = "rgb_color"
 ATTR_XY_COLOR = "xy_color"
 ATTR_EFFECT = "effect"
 
+# Storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30  # seconds
+SAVE_QUEUE_SIZE = 256
+
 # Events
 EVENT_STATE_SAVED = "light_state_saved"
 EVENT_STATE_RESTORED = "light_state_restored" 
\ No newline at end of file